@@ -3,12 +3,18 @@
 
 from .search_synthesizer import SearchSynthesizerAgent
 from .ecommerce_scraper import ECommerceScraperAgent
+from .sharded_scraper import ShardedECommerceScraperAgent
 from .deal_comparator import DealComparatorAgent
+from .best_deal_view import BestDealView
+from .price_alert import PriceAlertAgent
 from .coordinator import CoordinatorAgent
 
 __all__ = [
     "SearchSynthesizerAgent",
     "ECommerceScraperAgent",
+    "ShardedECommerceScraperAgent",
     "DealComparatorAgent",
+    "BestDealView",
+    "PriceAlertAgent",
     "CoordinatorAgent",
 ]
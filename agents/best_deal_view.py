@@ -0,0 +1,322 @@
+"""
+Best-Deal Materialized View.
+
+Responsibility:
+- Keep, for each canonical product and each objective, an indexed
+  min-heap over that product's offers.
+- Apply offer updates (price, shipping, delivery estimate) and
+  removals in O(log n) per heap instead of re-sorting.
+- Resolve search terms to a known canonical product so the
+  CoordinatorAgent can answer "best deal for product X" in O(1).
+
+Scores come from DealComparatorAgent. Ties are broken by the order in
+which offers were added to each product; `from_pipeline` adds them in
+scraper (catalog) order, which is the comparator's tie order too.
+
+A query resolves to a product only when every one of its search
+terms is a known alias of that product and, together, those aliases
+find exactly the product's offers. The view's answer is then the
+same best offer the pipeline would return; any other query falls
+back to the full pipeline.
+"""
+
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .deal_comparator import DealComparatorAgent, SUPPORTED_OBJECTIVES
+from .ecommerce_scraper import ECommerceScraperAgent
+from .search_synthesizer import SearchSynthesizerAgent
+from models.product_offer import ProductOffer
+
+
+# (score, insertion sequence): lower is better.
+HeapKey = Tuple[float, int]
+
+UPDATABLE_FIELDS = ("price", "shipping_cost", "estimated_delivery_days")
+
+
+class IndexedMinHeap:
+    """
+    Binary min-heap with a position index for O(log n) updates/removals.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[HeapKey, Hashable]] = []
+        self._pos: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._pos
+
+    def peek(self) -> Optional[Hashable]:
+        """Return the item with the smallest key, or None if empty."""
+        return self._heap[0][1] if self._heap else None
+
+    def push_or_update(self, item: Hashable, key: HeapKey) -> None:
+        """Insert `item` or change its key, restoring heap order."""
+        idx = self._pos.get(item)
+        if idx is None:
+            self._heap.append((key, item))
+            self._pos[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+
+        old_key = self._heap[idx][0]
+        self._heap[idx] = (key, item)
+        if key < old_key:
+            self._sift_up(idx)
+        else:
+            self._sift_down(idx)
+
+    def remove(self, item: Hashable) -> None:
+        """Remove `item` if present."""
+        idx = self._pos.pop(item, None)
+        if idx is None:
+            return
+
+        last = self._heap.pop()
+        if idx == len(self._heap):
+            return
+
+        self._heap[idx] = last
+        self._pos[last[1]] = idx
+        self._sift_up(idx)
+        self._sift_down(self._pos[last[1]])
+
+    # --- internal heap maintenance ---------------------------------------
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1]] = i
+        self._pos[heap[j][1]] = j
+
+    def _sift_up(self, idx: int) -> None:
+        while idx > 0:
+            parent = (idx - 1) // 2
+            if self._heap[idx][0] >= self._heap[parent][0]:
+                break
+            self._swap(idx, parent)
+            idx = parent
+
+    def _sift_down(self, idx: int) -> None:
+        size = len(self._heap)
+        while True:
+            smallest = idx
+            for child in (2 * idx + 1, 2 * idx + 2):
+                if (
+                    child < size
+                    and self._heap[child][0] < self._heap[smallest][0]
+                ):
+                    smallest = child
+            if smallest == idx:
+                break
+            self._swap(idx, smallest)
+            idx = smallest
+
+
+class BestDealView:
+    """
+    Incrementally maintained best offer per canonical product/objective.
+
+    Offers are identified by URL, which is unique per listing in the
+    catalogs. One offer may belong to several canonical products.
+    """
+
+    def __init__(
+        self, objectives: Sequence[str] = SUPPORTED_OBJECTIVES
+    ):
+        for obj in objectives:
+            if obj not in SUPPORTED_OBJECTIVES:
+                raise ValueError(f"Unsupported objective: {obj}")
+        self.objectives: List[str] = list(dict.fromkeys(objectives))
+
+        # alias -> (product id, URLs that alias finds on its own)
+        self._aliases: Dict[str, Tuple[str, Set[str]]] = {}
+        self._product_aliases: Dict[str, Set[str]] = {}
+        self._heaps: Dict[str, Dict[str, IndexedMinHeap]] = {}
+        self._offers: Dict[str, ProductOffer] = {}
+        # product id -> URL -> insertion order within that product
+        self._sequence: Dict[str, Dict[str, int]] = {}
+        self._next_sequence: Dict[str, int] = {}
+        self._memberships: Dict[str, Set[str]] = {}
+
+    # --- construction ----------------------------------------------------
+
+    @classmethod
+    def from_pipeline(
+        cls,
+        products: Dict[str, str],
+        search_agent: SearchSynthesizerAgent,
+        scraper_agent: ECommerceScraperAgent,
+        objectives: Sequence[str] = SUPPORTED_OBJECTIVES,
+    ) -> "BestDealView":
+        """
+        Build a view by running search + scraping once per product.
+
+        Every search variant of the representative query becomes an
+        alias, together with the offers that variant finds by itself.
+
+        :param products: Mapping from canonical product id to a
+                         representative client query.
+        :return: Populated BestDealView.
+        """
+        view = cls(objectives=objectives)
+        for product_id, query in products.items():
+            search_terms = search_agent.run(query)
+            view.register_product(
+                product_id,
+                {
+                    term: [o.url for o in scraper_agent.run([term])]
+                    for term in search_terms
+                },
+            )
+            for offer in scraper_agent.run(search_terms):
+                view.upsert_offer(product_id, offer)
+        return view
+
+    def register_product(
+        self, product_id: str, aliases: Dict[str, Iterable[str]]
+    ) -> None:
+        """
+        Declare a canonical product and the search phrases that name it.
+
+        :param aliases: Mapping from search phrase to the URLs of the
+                        offers that phrase matches on its own. Phrases
+                        are compared case-insensitively.
+        """
+        self._heaps.setdefault(
+            product_id,
+            {obj: IndexedMinHeap() for obj in self.objectives},
+        )
+        self._sequence.setdefault(product_id, {})
+        self._next_sequence.setdefault(product_id, 0)
+        product_aliases = self._product_aliases.setdefault(product_id, set())
+        for alias, urls in aliases.items():
+            normalized = alias.strip().lower()
+            if normalized:
+                self._aliases[normalized] = (product_id, set(urls))
+                product_aliases.add(normalized)
+
+    # --- lookups ---------------------------------------------------------
+
+    def resolve(self, search_terms: Iterable[str]) -> Optional[str]:
+        """
+        Return the canonical product id for the terms, if known.
+
+        Every term must be an alias of the same product, and the
+        aliases must together cover exactly that product's offers;
+        otherwise the terms would find a different set of offers.
+        """
+        product_id: Optional[str] = None
+        covered: Set[str] = set()
+        for term in search_terms:
+            entry = self._aliases.get(term.strip().lower())
+            if entry is None:
+                return None
+            alias_product, urls = entry
+            if product_id is None:
+                product_id = alias_product
+            elif alias_product != product_id:
+                return None
+            covered |= urls
+
+        if product_id is None:
+            return None
+        if covered != self._sequence[product_id].keys():
+            return None
+        return product_id
+
+    def best(
+        self, product_id: str, objective: str
+    ) -> Optional[ProductOffer]:
+        """Best offer for a product under an objective, in O(1)."""
+        heaps = self._heaps.get(product_id)
+        if heaps is None or objective not in heaps:
+            return None
+        url = heaps[objective].peek()
+        return None if url is None else self._offers[url]
+
+    def num_offers(self, product_id: str) -> int:
+        return len(self._sequence.get(product_id, ()))
+
+    # --- maintenance -----------------------------------------------------
+
+    def _key(self, product_id: str, objective: str, url: str) -> HeapKey:
+        offer = self._offers[url]
+        return (
+            DealComparatorAgent.score_metrics(
+                objective,
+                offer.total_price,
+                offer.estimated_delivery_days,
+            ),
+            self._sequence[product_id][url],
+        )
+
+    def _reindex(self, url: str) -> None:
+        for product_id in self._memberships.get(url, ()):
+            for obj, heap in self._heaps[product_id].items():
+                heap.push_or_update(url, self._key(product_id, obj, url))
+
+    def upsert_offer(self, product_id: str, offer: ProductOffer) -> None:
+        """Add an offer to a product, or replace the stored listing."""
+        if product_id not in self._heaps:
+            self.register_product(product_id, {})
+
+        url = offer.url
+        self._offers[url] = offer
+        sequence = self._sequence[product_id]
+        if url not in sequence:
+            sequence[url] = self._next_sequence[product_id]
+            self._next_sequence[product_id] += 1
+        self._memberships.setdefault(url, set()).add(product_id)
+        self._reindex(url)
+
+    def update_offer(self, url: str, **changes: float) -> ProductOffer:
+        """
+        Change price, shipping_cost and/or estimated_delivery_days.
+
+        The stored ProductOffer is updated in place, so catalogs that
+        share the same object see the new values too. Nothing is
+        changed if any field is not updatable.
+
+        :raises KeyError: If the offer is not in the view.
+        :raises ValueError: If a non-updatable field is passed.
+        """
+        offer = self._offers[url]
+        unsupported = [f for f in changes if f not in UPDATABLE_FIELDS]
+        if unsupported:
+            raise ValueError(
+                f"Unsupported offer field(s): {', '.join(unsupported)}"
+            )
+        for field_name, value in changes.items():
+            setattr(offer, field_name, value)
+        self._reindex(url)
+        return offer
+
+    def remove_offer(self, url: str) -> None:
+        """
+        Drop a delisted offer from every product it belongs to.
+
+        Aliases stop counting it as found, so queries for those
+        products still resolve to the view.
+        """
+        for product_id in self._memberships.pop(url, ()):
+            for heap in self._heaps[product_id].values():
+                heap.remove(url)
+            del self._sequence[product_id][url]
+            for alias in self._product_aliases[product_id]:
+                entry = self._aliases.get(alias)
+                if entry is not None:
+                    entry[1].discard(url)
+        self._offers.pop(url, None)
@@ -12,14 +12,19 @@ Responsibility:
 
 This is the "brain" of the system and is responsible for
 sequential execution, state passing, and data fusion.
+
+When a BestDealView is attached, `best_deal` answers queries for
+known canonical products straight from the view and only falls back
+to the full pipeline for unrecognized queries.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .base import Agent
 from .search_synthesizer import SearchSynthesizerAgent
 from .ecommerce_scraper import ECommerceScraperAgent
 from .deal_comparator import DealComparatorAgent
+from .best_deal_view import BestDealView
 
 
 class CoordinatorAgent(Agent):
@@ -32,10 +37,12 @@ class CoordinatorAgent(Agent):
         search_agent: SearchSynthesizerAgent,
         scraper_agent: ECommerceScraperAgent,
         comparator_agent: DealComparatorAgent,
+        deal_view: Optional[BestDealView] = None,
     ):
         self.search_agent = search_agent
         self.scraper_agent = scraper_agent
         self.comparator_agent = comparator_agent
+        self.deal_view = deal_view
 
     def run(self, client_request: str) -> Dict[str, Any]:
         """
@@ -59,8 +66,77 @@ class CoordinatorAgent(Agent):
             "search_terms": search_terms,
             "num_offers_found": len(comparison["ranked_offers"]),
             "deal_objective": comparison["objective"],
+            "deal_objectives": comparison["objectives"],
             "ranked_offers": comparison["ranked_offers"],
             "best_deal": comparison["best_deal"],
             "rationale": comparison["rationale"],
+            "rankings": comparison["rankings"],
         }
         return report
+
+    def best_deal(self, client_request: str) -> Dict[str, Any]:
+        """
+        Return only the best deal per objective for a request.
+
+        Known canonical products are answered from the attached
+        BestDealView without scraping or sorting; anything else runs
+        the full pipeline.
+
+        :param client_request: User's natural language product request.
+        :return: Dict with the best deal and rationale per objective.
+        """
+        search_terms = self.search_agent.run(client_request)
+        objectives = self.comparator_agent.objectives
+
+        product_id = None
+        if self.deal_view is not None and all(
+            obj in self.deal_view.objectives for obj in objectives
+        ):
+            product_id = self.deal_view.resolve(search_terms)
+
+        if product_id is not None:
+            best_deals: Dict[str, Any] = {}
+            rationales: Dict[str, str] = {}
+            for obj in objectives:
+                offer = self.deal_view.best(product_id, obj)
+                if offer is None:
+                    best_deals[obj] = None
+                    rationales[obj] = "No offers found."
+                    continue
+                best = {
+                    "rank": 1,
+                    **DealComparatorAgent.serialize_offer(
+                        offer, offer.total_price
+                    ),
+                }
+                best_deals[obj] = best
+                rationales[obj] = DealComparatorAgent.rationale_for(
+                    obj, best
+                )
+            return {
+                "original_request": client_request,
+                "search_terms": search_terms,
+                "source": "view",
+                "product_id": product_id,
+                "deal_objectives": list(objectives),
+                "best_deals": best_deals,
+                "rationales": rationales,
+            }
+
+        offers = self.scraper_agent.run(search_terms)
+        comparison = self.comparator_agent.run(offers)
+        return {
+            "original_request": client_request,
+            "search_terms": search_terms,
+            "source": "pipeline",
+            "product_id": None,
+            "deal_objectives": comparison["objectives"],
+            "best_deals": {
+                obj: view["best_deal"]
+                for obj, view in comparison["rankings"].items()
+            },
+            "rationales": {
+                obj: view["rationale"]
+                for obj, view in comparison["rankings"].items()
+            },
+        }
@@ -1,24 +1,30 @@
-
 """
 Deal Comparator Agent.
 
 Responsibility:
 - Receive a set of ProductOffer instances.
 - Compute a "final price" and other metrics.
-- Rank offers according to an optimization objective.
+- Rank offers according to one or more optimization objectives.
 - Provide a structured list of ranked deals.
 
 Objectives implemented in this prototype:
 - 'lowest_price': minimize total price (price + shipping).
 - 'fastest_delivery': prioritize earliest delivery, then price.
+
+When several objectives are requested, the shared per-offer metrics
+(total price, delivery days) are computed once and every ranking is
+produced from that single pass over the candidates.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .base import Agent
 from models.product_offer import ProductOffer
 
 
+SUPPORTED_OBJECTIVES = ("lowest_price", "fastest_delivery")
+
+
 class DealComparatorAgent(Agent):
     @property
     def name(self) -> str:
@@ -27,37 +33,89 @@ class DealComparatorAgent(Agent):
     def __init__(
         self,
         objective: str = "lowest_price",
+        objectives: Optional[Sequence[str]] = None,
     ):
-        if objective not in {"lowest_price", "fastest_delivery"}:
-            raise ValueError(
-                f"Unsupported objective: {objective}"
-            )
-        self.objective = objective
-
-    # --- internal scoring logic -----------------------------------------
-
-    def _score(self, offer: ProductOffer) -> float:
         """
-        Internal scoring function depending on objective.
+        :param objective: Single objective (kept for backwards compatibility).
+        :param objectives: Optional ordered set of objectives. When given,
+                           it takes precedence over `objective` and the
+                           first entry becomes the primary objective.
+        """
+        if objectives is None:
+            objectives = [objective]
+
+        # Preserve caller order while dropping duplicates.
+        unique = list(dict.fromkeys(objectives))
+        if not unique:
+            raise ValueError("At least one objective is required.")
+        for obj in unique:
+            if obj not in SUPPORTED_OBJECTIVES:
+                raise ValueError(
+                    f"Unsupported objective: {obj}"
+                )
+
+        self.objectives: List[str] = unique
+        self.objective = unique[0]
+
+    # --- scoring helpers (shared with BestDealView / CoordinatorAgent) ---
+
+    @staticmethod
+    def score_metrics(
+        objective: str, total_price: float, delivery_days: int
+    ) -> float:
+        """
+        Score precomputed offer metrics for a given objective.
 
         Lower scores are better.
 
         This is intentionally simple and transparent for teaching.
         """
-        if self.objective == "lowest_price":
-            return offer.total_price
+        if objective == "lowest_price":
+            return total_price
 
-        if self.objective == "fastest_delivery":
+        if objective == "fastest_delivery":
             # Weighted combination:
             #   - Delivery dominates.
             #   - Price breaks ties.
-            return (
-                offer.estimated_delivery_days * 10.0
-                + offer.total_price / 1000.0
-            )
+            return delivery_days * 10.0 + total_price / 1000.0
 
         # Fallback: treat as lowest_price
-        return offer.total_price
+        return total_price
+
+    @staticmethod
+    def serialize_offer(
+        offer: ProductOffer, total_price: float
+    ) -> Dict[str, Any]:
+        """Report-ready dict for an offer (without its rank)."""
+        return {
+            "platform": offer.platform,
+            "product_name": offer.product_name,
+            "seller": offer.seller,
+            "price": offer.price,
+            "shipping_cost": offer.shipping_cost,
+            "total_price": total_price,
+            "currency": offer.currency,
+            "estimated_delivery_days": offer.estimated_delivery_days,
+            "return_policy": offer.return_policy,
+            "url": offer.url,
+        }
+
+    @staticmethod
+    def rationale_for(objective: str, best: Dict[str, Any]) -> str:
+        """Explain why `best` (a serialized offer) won under `objective`."""
+        if objective == "lowest_price":
+            return (
+                f"Selected the offer with the lowest total price "
+                f"({best['total_price']} {best['currency']}) "
+                f"across all platforms."
+            )
+        if objective == "fastest_delivery":
+            return (
+                "Selected the offer with the fastest estimated delivery "
+                f"({best['estimated_delivery_days']} days), using total "
+                "price as a tie-breaker."
+            )
+        return "Selected best deal according to configured objective."
 
     # --- public API ------------------------------------------------------
 
@@ -67,57 +125,64 @@ class DealComparatorAgent(Agent):
         """
         Rank product offers and produce an analysis payload.
 
+        The top-level `ranked_offers`, `best_deal` and `rationale` keys
+        describe the primary objective; `rankings` holds one view per
+        requested objective.
+
         :param offers: List of ProductOffer from the scraper.
         :return: Dict containing ranked offers and an overall rationale.
         """
-        if not offers:
-            return {
-                "objective": self.objective,
-                "ranked_offers": [],
-                "best_deal": None,
-                "rationale": "No offers found.",
-            }
+        rankings: Dict[str, Dict[str, Any]] = {}
 
-        ranked = sorted(offers, key=self._score)
-
-        ranked_serialized: List[Dict[str, Any]] = []
-        for idx, offer in enumerate(ranked, start=1):
-            ranked_serialized.append(
-                {
-                    "rank": idx,
-                    "platform": offer.platform,
-                    "product_name": offer.product_name,
-                    "seller": offer.seller,
-                    "price": offer.price,
-                    "shipping_cost": offer.shipping_cost,
-                    "total_price": offer.total_price,
-                    "currency": offer.currency,
-                    "estimated_delivery_days": offer.estimated_delivery_days,
-                    "return_policy": offer.return_policy,
-                    "url": offer.url,
+        if not offers:
+            for obj in self.objectives:
+                rankings[obj] = {
+                    "ranked_offers": [],
+                    "best_deal": None,
+                    "rationale": "No offers found.",
                 }
-            )
-
-        best = ranked_serialized[0]
-
-        if self.objective == "lowest_price":
-            rationale = (
-                f"Selected the offer with the lowest total price "
-                f"({best['total_price']} {best['currency']}) "
-                f"across all platforms."
-            )
-        elif self.objective == "fastest_delivery":
-            rationale = (
-                "Selected the offer with the fastest estimated delivery "
-                f"({best['estimated_delivery_days']} days), using total "
-                "price as a tie-breaker."
-            )
         else:
-            rationale = "Selected best deal according to configured objective."
+            # Single pass: compute shared metrics and every objective's
+            # score per offer.
+            serialized: List[Dict[str, Any]] = []
+            keys: Dict[str, List[Tuple[float, int]]] = {
+                obj: [] for obj in self.objectives
+            }
+            for pos, offer in enumerate(offers):
+                total_price = offer.total_price
+                delivery_days = offer.estimated_delivery_days
+                serialized.append(self.serialize_offer(offer, total_price))
+                for obj in self.objectives:
+                    # Position keeps the sort stable, matching sorted().
+                    keys[obj].append(
+                        (
+                            self.score_metrics(
+                                obj, total_price, delivery_days
+                            ),
+                            pos,
+                        )
+                    )
+
+            for obj in self.objectives:
+                ranked_serialized: List[Dict[str, Any]] = [
+                    {"rank": idx, **serialized[pos]}
+                    for idx, (_, pos) in enumerate(
+                        sorted(keys[obj]), start=1
+                    )
+                ]
+                best = ranked_serialized[0]
+                rankings[obj] = {
+                    "ranked_offers": ranked_serialized,
+                    "best_deal": best,
+                    "rationale": self.rationale_for(obj, best),
+                }
 
+        primary = rankings[self.objective]
         return {
             "objective": self.objective,
-            "ranked_offers": ranked_serialized,
-            "best_deal": best,
-            "rationale": rationale,
+            "objectives": list(self.objectives),
+            "ranked_offers": primary["ranked_offers"],
+            "best_deal": primary["best_deal"],
+            "rationale": primary["rationale"],
+            "rankings": rankings,
         }
@@ -22,6 +22,11 @@ from .base import Agent
 from models.product_offer import ProductOffer
 
 
+def offer_haystack(offer: ProductOffer) -> str:
+    """Lowercased text that search terms are matched against."""
+    return f"{offer.product_name} {offer.seller}".lower()
+
+
 class ECommerceScraperAgent(Agent):
     @property
     def name(self) -> str:
@@ -55,9 +60,7 @@ class ECommerceScraperAgent(Agent):
 
         for platform, offers in self.catalogs.items():
             for offer in offers:
-                haystack = (
-                    f"{offer.product_name} {offer.seller}"
-                ).lower()
+                haystack = offer_haystack(offer)
                 if any(term in haystack for term in lowered_terms):
                     results.append(offer)
 
@@ -0,0 +1,349 @@
+"""
+Price Alert Agent.
+
+Responsibility:
+- Hold many standing PriceAlerts (saved queries with thresholds).
+- Match each incoming or updated ProductOffer against only the alerts
+  that could apply to it (a "percolator": the queries are indexed,
+  the documents are streamed through them).
+- Emit batched, de-duplicated AlertEvents.
+
+Saved queries are normalized through SearchSynthesizerAgent, so an
+alert matches exactly the offers the scraper would return for the same
+query (substring match of any variant), filtered by the thresholds.
+
+Each variant is indexed under one token that every matching offer must
+contain, chosen so the lookup is exact for the scraper's substring rule:
+- 3+ tokens: a middle token must be a whole token of the offer text.
+- 2 tokens: the last token must be a prefix of an offer token.
+- 1 token: the token must be a substring of an offer token.
+Inside each index bucket, alerts are grouped by delivery threshold
+(a handful of distinct day counts) and each group is sorted by price
+threshold. A lookup visits only groups whose delivery threshold lies
+above the offer's delivery days, and bisects each group so only alerts
+whose price threshold lies above the offer's total price are touched.
+"""
+
+import bisect
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .base import Agent
+from .ecommerce_scraper import offer_haystack
+from .search_synthesizer import SearchSynthesizerAgent
+from models.price_alert import AlertEvent, PriceAlert
+from models.product_offer import ProductOffer
+
+
+_EXACT = "exact"
+_PREFIX = "prefix"
+_SUBSTRING = "substring"
+_ANY = "any"
+
+
+class _PriceList:
+    """Alert ids sorted by ascending price threshold."""
+
+    def __init__(self):
+        self.thresholds: List[float] = []
+        self.alert_ids: List[str] = []
+
+    def add(self, threshold: float, alert_id: str) -> None:
+        idx = bisect.bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(idx, threshold)
+        self.alert_ids.insert(idx, alert_id)
+
+    def remove(self, threshold: float, alert_id: str) -> None:
+        idx = bisect.bisect_left(self.thresholds, threshold)
+        while self.alert_ids[idx] != alert_id:
+            idx += 1
+        del self.thresholds[idx]
+        del self.alert_ids[idx]
+
+    def above(self, total_price: float) -> List[str]:
+        """Alerts whose threshold is strictly above `total_price`."""
+        return self.alert_ids[
+            bisect.bisect_right(self.thresholds, total_price):
+        ]
+
+
+class _ThresholdBucket:
+    """
+    Alert ids indexed by (delivery threshold, price threshold).
+
+    Missing thresholds are stored as infinity (no limit).
+    """
+
+    def __init__(self):
+        self._delivery_thresholds: List[float] = []
+        self._by_delivery: Dict[float, _PriceList] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(
+        self, price_below: float, delivery_under: float, alert_id: str
+    ) -> None:
+        prices = self._by_delivery.get(delivery_under)
+        if prices is None:
+            prices = self._by_delivery[delivery_under] = _PriceList()
+            bisect.insort(self._delivery_thresholds, delivery_under)
+        prices.add(price_below, alert_id)
+        self._size += 1
+
+    def remove(
+        self, price_below: float, delivery_under: float, alert_id: str
+    ) -> None:
+        prices = self._by_delivery[delivery_under]
+        prices.remove(price_below, alert_id)
+        if not prices.alert_ids:
+            del self._by_delivery[delivery_under]
+            self._delivery_thresholds.remove(delivery_under)
+        self._size -= 1
+
+    def matching(
+        self, total_price: float, delivery_days: int
+    ) -> Iterable[str]:
+        """Alerts with both thresholds strictly above the offer's values."""
+        start = bisect.bisect_right(self._delivery_thresholds, delivery_days)
+        for delivery_under in self._delivery_thresholds[start:]:
+            yield from self._by_delivery[delivery_under].above(total_price)
+
+
+def _index_key(term: str) -> Tuple[str, str]:
+    """Pick the (kind, token) an alert variant is indexed under."""
+    tokens = term.split()
+    if len(tokens) >= 3:
+        return _EXACT, max(tokens[1:-1], key=len)
+    if len(tokens) == 2:
+        return _PREFIX, tokens[1]
+    if len(tokens) == 1:
+        return _SUBSTRING, tokens[0]
+    return _ANY, ""
+
+
+class PriceAlertAgent(Agent):
+    @property
+    def name(self) -> str:
+        return "PriceAlertAgent"
+
+    def __init__(
+        self,
+        search_agent: SearchSynthesizerAgent,
+        batch_size: int = 256,
+        on_events: Optional[Callable[[List[AlertEvent]], None]] = None,
+    ):
+        """
+        :param search_agent: Used to normalize saved alert queries.
+        :param batch_size: Pending offers that trigger an automatic flush.
+        :param on_events: Optional callback receiving each non-empty
+                          batch of events.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.search_agent = search_agent
+        self.batch_size = batch_size
+        self.on_events = on_events
+
+        self._alerts: Dict[str, PriceAlert] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._keys: Dict[str, Set[Tuple[str, str]]] = {}
+        self._index: Dict[Tuple[str, str], _ThresholdBucket] = {}
+        self._num_substring_keys = 0
+
+        # Offers coalesced by URL until the next flush.
+        self._pending: Dict[str, ProductOffer] = {}
+        # Alerts each offer currently satisfies (for de-duplication),
+        # and the reverse map so removing an alert is cheap.
+        self._active: Dict[str, Set[str]] = {}
+        self._active_urls: Dict[str, Set[str]] = {}
+
+    # --- alert management ------------------------------------------------
+
+    @staticmethod
+    def _thresholds(alert: PriceAlert) -> Tuple[float, float]:
+        """(price, delivery) thresholds, with None mapped to infinity."""
+        price_below = (
+            float("inf") if alert.price_below is None else alert.price_below
+        )
+        delivery_under = (
+            float("inf")
+            if alert.delivery_under_days is None
+            else alert.delivery_under_days
+        )
+        return price_below, delivery_under
+
+    def add_alert(self, alert: PriceAlert) -> None:
+        """
+        Register (or replace) a standing alert.
+
+        The query is normalized before any existing alert with the same
+        id is removed, so an invalid replacement keeps the old alert.
+        """
+        terms = sorted(
+            {t.lower() for t in self.search_agent.run(alert.query)}
+        )
+        keys = {_index_key(t) for t in terms}
+
+        if alert.alert_id in self._alerts:
+            self.remove_alert(alert.alert_id)
+
+        price_below, delivery_under = self._thresholds(alert)
+        for key in keys:
+            bucket = self._index.get(key)
+            if bucket is None:
+                bucket = self._index[key] = _ThresholdBucket()
+                if key[0] == _SUBSTRING:
+                    self._num_substring_keys += 1
+            bucket.add(price_below, delivery_under, alert.alert_id)
+
+        self._alerts[alert.alert_id] = alert
+        self._terms[alert.alert_id] = terms
+        self._keys[alert.alert_id] = keys
+
+    def remove_alert(self, alert_id: str) -> None:
+        """Drop a standing alert; unknown ids are ignored."""
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return
+
+        price_below, delivery_under = self._thresholds(alert)
+        for key in self._keys.pop(alert_id):
+            bucket = self._index[key]
+            bucket.remove(price_below, delivery_under, alert_id)
+            if not bucket:
+                del self._index[key]
+                if key[0] == _SUBSTRING:
+                    self._num_substring_keys -= 1
+        del self._terms[alert_id]
+
+        for url in self._active_urls.pop(alert_id, ()):
+            active = self._active[url]
+            active.discard(alert_id)
+            if not active:
+                del self._active[url]
+
+    # --- matching --------------------------------------------------------
+
+    def _candidate_alerts(
+        self, haystack: str, total_price: float, delivery_days: int
+    ) -> Set[str]:
+        tokens = haystack.split()
+        lookups: List[Tuple[str, str]] = [(_ANY, "")]
+        lookups.extend((_EXACT, tok) for tok in tokens)
+        for tok in tokens:
+            lookups.extend(
+                (_PREFIX, tok[:end]) for end in range(1, len(tok) + 1)
+            )
+        if self._num_substring_keys:
+            for tok in tokens:
+                for start in range(len(tok)):
+                    lookups.extend(
+                        (_SUBSTRING, tok[start:end])
+                        for end in range(start + 1, len(tok) + 1)
+                    )
+
+        candidates: Set[str] = set()
+        for key in lookups:
+            bucket = self._index.get(key)
+            if bucket is not None:
+                candidates.update(
+                    bucket.matching(total_price, delivery_days)
+                )
+        return candidates
+
+    def match(self, offer: ProductOffer) -> List[str]:
+        """
+        Return ids of all alerts the offer currently satisfies.
+
+        This is stateless; use `submit`/`flush` for de-duplicated events.
+        """
+        haystack = offer_haystack(offer)
+        candidates = self._candidate_alerts(
+            haystack, offer.total_price, offer.estimated_delivery_days
+        )
+        # Thresholds are already satisfied; confirm the text match.
+        matched: List[str] = []
+        for alert_id in candidates:
+            if any(term in haystack for term in self._terms[alert_id]):
+                matched.append(alert_id)
+        return sorted(matched)
+
+    # --- streaming API ---------------------------------------------------
+
+    def submit(self, offer: ProductOffer) -> List[AlertEvent]:
+        """
+        Queue a new or updated offer.
+
+        Repeated submissions of the same URL before a flush are
+        coalesced. Returns events if this submission triggered a flush.
+        """
+        self._pending[offer.url] = offer
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def _set_active(self, url: str, alert_ids: Set[str]) -> None:
+        """Record which alerts `url` satisfies, keeping both maps in sync."""
+        for alert_id in self._active.get(url, set()) - alert_ids:
+            urls = self._active_urls[alert_id]
+            urls.discard(url)
+            if not urls:
+                del self._active_urls[alert_id]
+        for alert_id in alert_ids:
+            self._active_urls.setdefault(alert_id, set()).add(url)
+
+        if alert_ids:
+            self._active[url] = alert_ids
+        else:
+            self._active.pop(url, None)
+
+    def remove_offer(self, url: str) -> None:
+        """Forget a delisted offer so it can alert again if relisted."""
+        self._pending.pop(url, None)
+        self._set_active(url, set())
+
+    def flush(self) -> List[AlertEvent]:
+        """
+        Match all pending offers and emit de-duplicated events.
+
+        An event is emitted when an offer starts satisfying an alert;
+        it is not repeated while the offer keeps satisfying it, and is
+        re-armed once the offer stops matching.
+        """
+        pending, self._pending = self._pending, {}
+
+        events: List[AlertEvent] = []
+        for url, offer in pending.items():
+            matched = self.match(offer)
+            previous = self._active.get(url, set())
+            for alert_id in matched:
+                if alert_id not in previous:
+                    events.append(
+                        AlertEvent(
+                            alert_id=alert_id,
+                            offer=offer,
+                            total_price=offer.total_price,
+                            estimated_delivery_days=(
+                                offer.estimated_delivery_days
+                            ),
+                        )
+                    )
+            self._set_active(url, set(matched))
+
+        if events and self.on_events is not None:
+            self.on_events(events)
+        return events
+
+    def run(self, offers: Iterable[ProductOffer]) -> List[AlertEvent]:
+        """
+        Stream a batch of offers through the alerts.
+
+        :param offers: New or updated ProductOffer instances.
+        :return: All AlertEvents emitted while processing them.
+        """
+        events: List[AlertEvent] = []
+        for offer in offers:
+            events.extend(self.submit(offer))
+        events.extend(self.flush())
+        return events
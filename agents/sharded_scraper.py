@@ -0,0 +1,221 @@
+"""
+Sharded E-Commerce Scraper Agent.
+
+Responsibility:
+- Partition the catalogs across a pool of worker processes.
+- Scatter each query to every shard.
+- Gather the per-shard matches and merge them into one result list.
+
+Each worker owns only its shard of pre-lowercased offer text, so
+matching runs in parallel across cores instead of inside a single
+GIL-bound process. Workers return lightweight offer keys rather than
+pickled offers; the coordinating process maps the keys back to its
+own ProductOffer objects. Because keys encode the catalog iteration
+order, the merged result is identical to ECommerceScraperAgent.run.
+
+Adapted from the original request in two ways:
+- Each worker receives a pickled copy of its shard when it starts,
+  not a view into shared memory; ProductOffer is a plain dataclass
+  and the project is stdlib-only.
+- Shards return all of their matches rather than "local top
+  candidates", because the scraper filters but does not rank.
+
+Shards are a snapshot of `catalogs` taken when the agent is built.
+Call `reload()` after adding, removing or renaming offers so the
+shards match the catalogs again.
+
+One agent can be shared between threads, but a per-agent lock runs
+queries one at a time: concurrent callers (e.g. the load tester's 32
+worker threads) queue on it, and only the shards run in parallel.
+"""
+
+import heapq
+import multiprocessing
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from .ecommerce_scraper import ECommerceScraperAgent, offer_haystack
+from models.product_offer import ProductOffer
+
+
+# (platform index, offer index) in catalog iteration order.
+OfferKey = Tuple[int, int]
+
+SUPPORTED_SHARD_STRATEGIES = ("platform", "hash")
+
+
+def _shard_worker(conn, entries: List[Tuple[OfferKey, str]]) -> None:
+    """
+    Worker loop: hold one shard and answer queries until told to stop.
+
+    :param conn: Worker end of a multiprocessing Pipe.
+    :param entries: (key, haystack) pairs for this shard, sorted by key.
+    """
+    try:
+        while True:
+            lowered_terms = conn.recv()
+            if lowered_terms is None:
+                break
+            conn.send(
+                [
+                    key
+                    for key, haystack in entries
+                    if any(term in haystack for term in lowered_terms)
+                ]
+            )
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        conn.close()
+
+
+class ShardedECommerceScraperAgent(ECommerceScraperAgent):
+    @property
+    def name(self) -> str:
+        return "ShardedECommerceScraperAgent"
+
+    def __init__(
+        self,
+        catalogs: Dict[str, List[ProductOffer]],
+        num_shards: Optional[int] = None,
+        shard_by: str = "platform",
+    ):
+        """
+        :param catalogs: Mapping from platform name to a list of
+                         ProductOffer entries (demo catalogs).
+        :param num_shards: Number of worker processes. Defaults to the
+                           CPU count. Capped by the number of platforms
+                           when sharding by platform.
+        :param shard_by: 'platform' keeps each platform on one shard;
+                         'hash' spreads offers by a stable hash of URL.
+        """
+        super().__init__(catalogs)
+
+        if shard_by not in SUPPORTED_SHARD_STRATEGIES:
+            raise ValueError(f"Unsupported shard strategy: {shard_by}")
+        if num_shards is None:
+            num_shards = multiprocessing.cpu_count()
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+
+        self.requested_shards = num_shards
+        self.shard_by = shard_by
+
+        self._lock = threading.Lock()
+        self._offers_by_key: Dict[OfferKey, ProductOffer] = {}
+        self._workers: List[multiprocessing.Process] = []
+        self._conns = []
+        self._start_workers()
+
+    # --- shard management ------------------------------------------------
+
+    def _shard_for(self, platform_idx: int, offer: ProductOffer) -> int:
+        if self.shard_by == "platform":
+            return platform_idx % self.num_shards
+        # crc32 is stable across processes, unlike the builtin hash().
+        return zlib.crc32(offer.url.encode("utf-8")) % self.num_shards
+
+    def _start_workers(self) -> None:
+        num_shards = self.requested_shards
+        if self.shard_by == "platform":
+            # Extra workers would only ever hold empty shards.
+            num_shards = min(num_shards, max(len(self.catalogs), 1))
+        self.num_shards = num_shards
+
+        self._offers_by_key = {}
+        shards: List[List[Tuple[OfferKey, str]]] = [
+            [] for _ in range(self.num_shards)
+        ]
+        for platform_idx, offers in enumerate(self.catalogs.values()):
+            for offer_idx, offer in enumerate(offers):
+                key = (platform_idx, offer_idx)
+                self._offers_by_key[key] = offer
+                shards[self._shard_for(platform_idx, offer)].append(
+                    (key, offer_haystack(offer))
+                )
+
+        for entries in shards:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_shard_worker,
+                args=(child_conn, entries),
+                daemon=True,
+            )
+            worker.start()
+            child_conn.close()
+            self._workers.append(worker)
+            self._conns.append(parent_conn)
+
+    def _stop_workers(self) -> None:
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self._conns = []
+        self._workers = []
+
+    def reload(self) -> None:
+        """Rebuild every shard from the current contents of `catalogs`."""
+        with self._lock:
+            self._stop_workers()
+            self._start_workers()
+
+    def close(self) -> None:
+        """Stop all shard workers. Safe to call more than once."""
+        with self._lock:
+            self._stop_workers()
+
+    def __enter__(self) -> "ShardedECommerceScraperAgent":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- public API ------------------------------------------------------
+
+    def run(self, search_terms: List[str]) -> List[ProductOffer]:
+        """
+        Scatter the search terms to every shard and merge the matches.
+
+        :param search_terms: List of search strings from the
+                             SearchSynthesizerAgent.
+        :return: List of matching ProductOffer objects, in the same
+                 order as the single-process scraper.
+        """
+        if not search_terms:
+            return []
+
+        lowered_terms = [t.lower() for t in search_terms]
+
+        # One query at a time owns the pipes, so replies cannot be
+        # picked up by another caller.
+        with self._lock:
+            if not self._conns:
+                raise RuntimeError("Shard workers have been closed.")
+            try:
+                # Scatter first so shards work concurrently, then gather.
+                for conn in self._conns:
+                    conn.send(lowered_terms)
+                shard_keys: List[List[OfferKey]] = [
+                    conn.recv() for conn in self._conns
+                ]
+            except (EOFError, BrokenPipeError, OSError) as exc:
+                # Surviving shards may hold unread replies; tear the
+                # pool down so later queries cannot read stale ones.
+                self._stop_workers()
+                raise RuntimeError(
+                    "A shard worker exited unexpectedly; "
+                    "call reload() to restart the shards."
+                ) from exc
+
+            return [
+                self._offers_by_key[key]
+                for key in heapq.merge(*shard_keys)
+            ]
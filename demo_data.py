@@ -147,3 +147,16 @@ def load_demo_catalogs() -> Dict[str, List[ProductOffer]]:
     ]
 
     return catalogs
+
+
+def load_demo_products() -> Dict[str, str]:
+    """
+    Returns canonical demo products keyed by product id.
+
+    Each value is a representative client query; BestDealView uses it
+    to collect the product's offers and the search phrases naming it.
+    """
+    return {
+        "apple-watch-se-2-40mm-starlight": "Apple Watch SE",
+        "bose-qc-ultra-black": "Bose QC Ultra",
+    }
@@ -0,0 +1,204 @@
+"""
+Load tester for the Multi-Agent E-Commerce Deal Finder.
+
+Replays a query log against CoordinatorAgent in process (default) or
+against a long-running HTTP service, using open-loop arrivals, and
+ramps the request rate to find the saturation point.
+
+Usage (from project root):
+
+    python load_test.py \
+        --ramp 500 5000 500 \
+        --duration 5 \
+        --slo-p99-ms 20 \
+        --output-json load_report.json
+
+    python load_test.py \
+        --query-log queries.jsonl \
+        --url http://localhost:8000/deals \
+        --qps 20 --duration 30
+
+Query logs are JSONL with one {"query": ..., "objective": ...} per line.
+Without --query-log a Zipf-skewed synthetic log is generated.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from demo_data import load_demo_catalogs, load_demo_products
+from utils.load_test import (
+    load_query_log,
+    make_coordinator_target,
+    make_http_target,
+    render_load_test_summary,
+    run_load_test,
+    synthetic_query_log,
+)
+
+
+# Known products plus longer phrasings, partial matches and a miss,
+# so synthetic traffic exercises every path of the pipeline.
+SYNTHETIC_QUERIES = list(load_demo_products().values()) + [
+    "Apple Watch SE 2nd Gen 40mm Starlight",
+    "Bose QuietComfort Ultra",
+    "best deal starlight",
+    "cheap headphones",
+    "Samsung Galaxy Buds",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query-log replay load tester for the deal finder"
+    )
+    parser.add_argument(
+        "--query-log",
+        type=str,
+        default=None,
+        help="JSONL query log to replay (default: synthetic log).",
+    )
+    parser.add_argument(
+        "--synthetic-size",
+        type=int,
+        default=10000,
+        help="Number of entries in the synthetic query log.",
+    )
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=1.1,
+        help="Zipf exponent for repetition skew in the synthetic log.",
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default=None,
+        help=(
+            "POST requests to this service URL instead of calling "
+            "CoordinatorAgent in process."
+        ),
+    )
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument(
+        "--qps",
+        type=float,
+        default=None,
+        help="Run a single step at this request rate.",
+    )
+    rate.add_argument(
+        "--ramp",
+        type=float,
+        nargs=3,
+        metavar=("START", "STOP", "STEP"),
+        default=None,
+        help="Ramp the request rate from START to STOP (inclusive).",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=5.0,
+        help="Seconds of traffic per rate step.",
+    )
+    parser.add_argument(
+        "--arrival",
+        type=str,
+        default="poisson",
+        choices=["poisson", "uniform"],
+        help="Inter-arrival process for open-loop traffic.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=32,
+        help="Maximum concurrent in-flight requests.",
+    )
+    parser.add_argument(
+        "--slo-p99-ms",
+        type=float,
+        default=None,
+        help="Treat a step as saturated when p99 exceeds this.",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=0.01,
+        help="Treat a step as saturated above this error rate.",
+    )
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Run every ramp step even after saturation.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for the synthetic log and arrivals.",
+    )
+    parser.add_argument(
+        "--output-json",
+        type=str,
+        default=None,
+        help="Path to save the JSON report (optional).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.query_log:
+        query_log = load_query_log(args.query_log)
+    else:
+        query_log = synthetic_query_log(
+            SYNTHETIC_QUERIES,
+            ["lowest_price", "fastest_delivery"],
+            size=args.synthetic_size,
+            skew=args.skew,
+            seed=args.seed,
+        )
+
+    if args.url:
+        target = make_http_target(args.url)
+    else:
+        target = make_coordinator_target(load_demo_catalogs())
+
+    if args.ramp:
+        start, stop, step = args.ramp
+        if step <= 0:
+            raise SystemExit("--ramp STEP must be positive.")
+        qps_steps = []
+        qps = start
+        while qps <= stop + 1e-9:
+            qps_steps.append(qps)
+            qps += step
+    else:
+        qps_steps = [args.qps if args.qps is not None else 10.0]
+
+    report = run_load_test(
+        target,
+        query_log,
+        qps_steps,
+        duration_s=args.duration,
+        workers=args.workers,
+        arrival=args.arrival,
+        p99_slo_ms=args.slo_p99_ms,
+        max_error_rate=args.max_error_rate,
+        stop_at_saturation=not args.keep_going,
+        seed=args.seed,
+    )
+    report["config"]["target"] = args.url or "in-process CoordinatorAgent"
+
+    print(render_load_test_summary(report))
+
+    if args.output_json:
+        output_path = Path(args.output_json)
+        output_path.write_text(
+            json.dumps(report, indent=2), encoding="utf-8"
+        )
+        print(f"JSON report written to: {output_path.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,18 @@ Usage (from project root):
         --objective lowest_price \
         --output-json report.json
 
+Several objectives can be ranked in one run:
+
+    python main.py \
+        --query "Bose QC Ultra" \
+        --objective lowest_price fastest_delivery
+
+Scan the catalogs with a pool of shard worker processes:
+
+    python main.py \
+        --query "Apple Watch SE" \
+        --shards 4 --shard-by hash
+
 """
 
 import argparse
@@ -18,11 +30,21 @@ from pathlib import Path
 from agents.coordinator import CoordinatorAgent
 from agents.search_synthesizer import SearchSynthesizerAgent
 from agents.ecommerce_scraper import ECommerceScraperAgent
+from agents.sharded_scraper import ShardedECommerceScraperAgent
 from agents.deal_comparator import DealComparatorAgent
 from demo_data import load_demo_catalogs
 from utils.formatting import render_markdown_report
 
 
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            f"must be 0 or greater, got {number}"
+        )
+    return number
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Multi-Agent E-Commerce Deal Finder"
@@ -36,9 +58,29 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--objective",
         type=str,
-        default="lowest_price",
+        nargs="+",
+        default=["lowest_price"],
         choices=["lowest_price", "fastest_delivery"],
-        help="Optimization objective for the deal comparator.",
+        help=(
+            "One or more optimization objectives for the deal "
+            "comparator. The first one is the primary objective."
+        ),
+    )
+    parser.add_argument(
+        "--shards",
+        type=_non_negative_int,
+        default=0,
+        help=(
+            "Number of shard worker processes for catalog scanning "
+            "(0 = single-process scraper)."
+        ),
+    )
+    parser.add_argument(
+        "--shard-by",
+        type=str,
+        default="platform",
+        choices=["platform", "hash"],
+        help="How offers are partitioned across shard workers.",
     )
     parser.add_argument(
         "--output-json",
@@ -54,11 +96,18 @@ def main() -> None:
 
     # Initialize agents
     search_agent = SearchSynthesizerAgent()
-    scraper_agent = ECommerceScraperAgent(
-        catalogs=load_demo_catalogs()
-    )
+    if args.shards > 0:
+        scraper_agent = ShardedECommerceScraperAgent(
+            catalogs=load_demo_catalogs(),
+            num_shards=args.shards,
+            shard_by=args.shard_by,
+        )
+    else:
+        scraper_agent = ECommerceScraperAgent(
+            catalogs=load_demo_catalogs()
+        )
     comparator_agent = DealComparatorAgent(
-        objective=args.objective
+        objectives=args.objective
     )
     coordinator = CoordinatorAgent(
         search_agent=search_agent,
@@ -67,7 +116,11 @@ def main() -> None:
     )
 
     # Run full workflow
-    report = coordinator.run(args.query)
+    try:
+        report = coordinator.run(args.query)
+    finally:
+        if isinstance(scraper_agent, ShardedECommerceScraperAgent):
+            scraper_agent.close()
 
     # Print Markdown report to console
     md = render_markdown_report(report)
@@ -1,4 +1,4 @@
-
 from .product_offer import ProductOffer
+from .price_alert import AlertEvent, PriceAlert
 
-__all__ = ["ProductOffer"]
+__all__ = ["ProductOffer", "PriceAlert", "AlertEvent"]
@@ -0,0 +1,30 @@
+"""
+Domain models for standing price alerts.
+
+A PriceAlert is a saved client query with optional price and delivery
+thresholds; an AlertEvent records that an offer started satisfying it.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .product_offer import ProductOffer
+
+
+@dataclass
+class PriceAlert:
+    alert_id: str
+    query: str
+    # Fire only when total price (price + shipping) is strictly below this.
+    price_below: Optional[float] = None
+    # Fire only when estimated delivery is strictly under this many days.
+    delivery_under_days: Optional[int] = None
+
+
+@dataclass
+class AlertEvent:
+    alert_id: str
+    offer: ProductOffer
+    # Snapshot at match time; the offer itself may be updated later.
+    total_price: float
+    estimated_delivery_days: int
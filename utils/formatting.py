@@ -82,6 +82,14 @@ def render_markdown_report(report: Dict[str, Any]) -> str:
 
     lines.append(_render_offers_table(report["ranked_offers"]))
 
+    # Additional rankings (one view per extra objective)
+    rankings = report.get("rankings", {})
+    for objective, view in rankings.items():
+        if objective == report["deal_objective"]:
+            continue
+        lines.append(f"### Ranking by {objective}\n")
+        lines.append(_render_offers_table(view["ranked_offers"]))
+
     # Best deal
     lines.append("## 4. Recommended Deal\n")
     best = report["best_deal"]
@@ -102,6 +110,12 @@ def render_markdown_report(report: Dict[str, Any]) -> str:
     # Rationale
     lines.append("## 5. Rationale\n")
     lines.append(report["rationale"] + "\n")
+    for objective, view in rankings.items():
+        if objective == report["deal_objective"]:
+            continue
+        lines.append(f"- **{objective}:** {view['rationale']}")
+    if len(rankings) > 1:
+        lines.append("")
 
     # System-level explanation (for the course / instructor)
     lines.append("## 6. Multi-Agent Workflow Trace\n")
@@ -109,7 +123,7 @@ def render_markdown_report(report: Dict[str, Any]) -> str:
         "- CoordinatorAgent orchestrated the workflow and assembled this report.\n"
         "- SearchSynthesizerAgent expanded the client request into multiple search terms.\n"
         "- ECommerceScraperAgent (mock) queried normalized demo catalogs for each platform.\n"
-        "- DealComparatorAgent scored and ranked all offers according to the selected objective.\n"
+        "- DealComparatorAgent scored and ranked all offers according to the selected objective(s).\n"
     )
 
     return "\n".join(lines)
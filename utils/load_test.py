@@ -0,0 +1,459 @@
+"""
+Query-log replay load testing for the deal finder.
+
+Replays a recorded or synthetic query log (query text + objective)
+against a target using open-loop arrivals: requests are issued on a
+fixed schedule regardless of how fast earlier ones complete, and
+latency is measured from the scheduled send time so queueing delay is
+not hidden. A QPS ramp is run step by step to locate saturation.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from agents.coordinator import CoordinatorAgent
+from agents.deal_comparator import DealComparatorAgent
+from agents.ecommerce_scraper import ECommerceScraperAgent
+from agents.search_synthesizer import SearchSynthesizerAgent
+from models.product_offer import ProductOffer
+
+
+# A target receives one log entry ({"query", "objective"}) and either
+# returns normally or raises on failure.
+Target = Callable[[Dict[str, str]], Any]
+
+
+# --- query logs ----------------------------------------------------------
+
+def load_query_log(path: str) -> List[Dict[str, str]]:
+    """
+    Load a JSONL query log; each line needs a "query" and may set
+    an "objective" (defaults to lowest_price).
+    """
+    entries: List[Dict[str, str]] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        entries.append(
+            {
+                "query": record["query"],
+                "objective": record.get("objective", "lowest_price"),
+            }
+        )
+    if not entries:
+        raise ValueError(f"Query log is empty: {path}")
+    return entries
+
+
+def synthetic_query_log(
+    queries: Sequence[str],
+    objectives: Sequence[str],
+    size: int,
+    skew: float = 1.1,
+    seed: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Build a query log with Zipf-like repetition skew.
+
+    The i-th (query, objective) pair is drawn with weight 1 / i**skew,
+    so a few popular requests dominate, as in real traffic.
+    """
+    rng = random.Random(seed)
+    pairs = [
+        {"query": q, "objective": obj}
+        for q in queries
+        for obj in objectives
+    ]
+    rng.shuffle(pairs)
+    weights = [1.0 / (rank ** skew) for rank in range(1, len(pairs) + 1)]
+    return [dict(p) for p in rng.choices(pairs, weights=weights, k=size)]
+
+
+def _cycle(entries: List[Dict[str, str]]) -> Iterator[Dict[str, str]]:
+    while True:
+        yield from entries
+
+
+# --- targets -------------------------------------------------------------
+
+def make_coordinator_target(
+    catalogs: Dict[str, List[ProductOffer]]
+) -> Target:
+    """
+    In-process target: one CoordinatorAgent per objective, sharing the
+    search and scraper agents.
+    """
+    search_agent = SearchSynthesizerAgent()
+    scraper_agent = ECommerceScraperAgent(catalogs=catalogs)
+    coordinators: Dict[str, CoordinatorAgent] = {}
+    lock = threading.Lock()
+
+    def call(entry: Dict[str, str]) -> Any:
+        objective = entry["objective"]
+        coordinator = coordinators.get(objective)
+        if coordinator is None:
+            with lock:
+                coordinator = coordinators.setdefault(
+                    objective,
+                    CoordinatorAgent(
+                        search_agent=search_agent,
+                        scraper_agent=scraper_agent,
+                        comparator_agent=DealComparatorAgent(
+                            objective=objective
+                        ),
+                    ),
+                )
+        return coordinator.run(entry["query"])
+
+    return call
+
+
+def make_http_target(url: str, timeout: float = 10.0) -> Target:
+    """
+    Target for a long-running service: POSTs each entry as JSON to
+    `url`. Non-2xx responses raise and are counted as errors.
+    """
+
+    def call(entry: Dict[str, str]) -> Any:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(entry).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read()
+
+    return call
+
+
+# --- measurement helpers -------------------------------------------------
+
+def _current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or peak RSS as a fallback."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS reports bytes.
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _MemorySampler:
+    """Background thread recording RSS at a fixed interval."""
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self.samples: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _record(self) -> None:
+        self.samples.append(
+            {
+                "elapsed_s": round(time.perf_counter() - self._start, 3),
+                "rss_bytes": _current_rss_bytes(),
+            }
+        )
+
+    def _loop(self) -> None:
+        self._record()
+        while not self._stop.wait(self.interval_s):
+            self._record()
+
+    def __enter__(self) -> "_MemorySampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._record()
+
+
+def _timed_call(
+    target: Target, entry: Dict[str, str], scheduled: float
+) -> Dict[str, Any]:
+    error = None
+    try:
+        target(entry)
+    except Exception as exc:  # noqa: BLE001 - every failure is a data point
+        error = f"{type(exc).__name__}: {exc}"
+    done = time.perf_counter()
+    return {"latency_s": done - scheduled, "done": done, "error": error}
+
+
+# --- load generation -----------------------------------------------------
+
+def run_step(
+    target: Target,
+    entries: Iterator[Dict[str, str]],
+    qps: float,
+    duration_s: float,
+    executor: ThreadPoolExecutor,
+    arrival: str = "poisson",
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """
+    Issue open-loop traffic at `qps` for `duration_s` seconds.
+
+    :return: Step summary with latency percentiles (ms), throughput
+             and error rate.
+    """
+    if qps <= 0:
+        raise ValueError("qps must be positive.")
+    if arrival not in {"poisson", "uniform"}:
+        raise ValueError(f"Unsupported arrival process: {arrival}")
+    rng = rng or random.Random()
+
+    start = time.perf_counter()
+    futures = []
+    offset = 0.0
+    while True:
+        offset += (
+            rng.expovariate(qps) if arrival == "poisson" else 1.0 / qps
+        )
+        if offset >= duration_s:
+            break
+        scheduled = start + offset
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(
+            executor.submit(_timed_call, target, next(entries), scheduled)
+        )
+
+    results = [f.result() for f in futures]
+    end = max([r["done"] for r in results], default=time.perf_counter())
+    elapsed = max(end - start, duration_s)
+
+    errors = [r for r in results if r["error"] is not None]
+    latencies_ms = sorted(
+        r["latency_s"] * 1000.0 for r in results if r["error"] is None
+    )
+    completed = len(latencies_ms)
+
+    return {
+        "target_qps": qps,
+        "duration_s": duration_s,
+        "requests": len(results),
+        "completed": completed,
+        "errors": len(errors),
+        "error_rate": len(errors) / len(results) if results else 0.0,
+        "throughput_qps": completed / elapsed,
+        "latency_ms": {
+            "p50": _percentile(latencies_ms, 50),
+            "p95": _percentile(latencies_ms, 95),
+            "p99": _percentile(latencies_ms, 99),
+            "max": latencies_ms[-1] if latencies_ms else 0.0,
+            "mean": (
+                sum(latencies_ms) / completed if completed else 0.0
+            ),
+        },
+        "sample_errors": sorted({r["error"] for r in errors})[:5],
+        "rss_bytes_end": _current_rss_bytes(),
+    }
+
+
+def _saturation_reason(
+    step: Dict[str, Any],
+    p99_slo_ms: Optional[float],
+    max_error_rate: float,
+    min_throughput_ratio: float,
+) -> Optional[str]:
+    if step["error_rate"] > max_error_rate:
+        return f"error rate {step['error_rate']:.2%} > {max_error_rate:.2%}"
+    if step["throughput_qps"] < min_throughput_ratio * step["target_qps"]:
+        return (
+            f"throughput {step['throughput_qps']:.1f} qps < "
+            f"{min_throughput_ratio:.0%} of target"
+        )
+    if p99_slo_ms is not None and step["latency_ms"]["p99"] > p99_slo_ms:
+        return (
+            f"p99 {step['latency_ms']['p99']:.1f} ms > "
+            f"SLO {p99_slo_ms:.1f} ms"
+        )
+    return None
+
+
+def run_load_test(
+    target: Target,
+    query_log: List[Dict[str, str]],
+    qps_steps: Sequence[float],
+    duration_s: float,
+    workers: int = 32,
+    arrival: str = "poisson",
+    p99_slo_ms: Optional[float] = None,
+    max_error_rate: float = 0.01,
+    min_throughput_ratio: float = 0.9,
+    stop_at_saturation: bool = True,
+    memory_interval_s: float = 0.5,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Replay `query_log` at each rate in `qps_steps` and find saturation.
+
+    A step is saturated when its error rate, achieved throughput or
+    p99 latency crosses the configured limits; the last unsaturated
+    step is reported as the sustainable rate.
+
+    :return: JSON-serializable report.
+    """
+    if not query_log:
+        raise ValueError("Query log is empty.")
+
+    rng = random.Random(seed)
+    entries = _cycle(query_log)
+    steps: List[Dict[str, Any]] = []
+    saturation: Dict[str, Any] = {
+        "saturated_at_qps": None,
+        "max_sustainable_qps": None,
+        "reason": None,
+    }
+
+    with _MemorySampler(memory_interval_s) as sampler:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for qps in qps_steps:
+                step = run_step(
+                    target,
+                    entries,
+                    qps,
+                    duration_s,
+                    executor,
+                    arrival=arrival,
+                    rng=rng,
+                )
+                reason = _saturation_reason(
+                    step, p99_slo_ms, max_error_rate, min_throughput_ratio
+                )
+                step["saturated"] = reason is not None
+                steps.append(step)
+
+                if reason is None:
+                    saturation["max_sustainable_qps"] = qps
+                elif saturation["saturated_at_qps"] is None:
+                    saturation["saturated_at_qps"] = qps
+                    saturation["reason"] = reason
+                    if stop_at_saturation:
+                        break
+
+    timeline = sampler.samples
+    rss_values = [s["rss_bytes"] for s in timeline if s["rss_bytes"]]
+    return {
+        "config": {
+            "qps_steps": list(qps_steps),
+            "step_duration_s": duration_s,
+            "workers": workers,
+            "arrival": arrival,
+            "p99_slo_ms": p99_slo_ms,
+            "max_error_rate": max_error_rate,
+            "min_throughput_ratio": min_throughput_ratio,
+            "query_log_size": len(query_log),
+            "distinct_requests": len(
+                {(e["query"], e["objective"]) for e in query_log}
+            ),
+        },
+        "steps": steps,
+        "saturation": saturation,
+        "memory": {
+            "timeline": timeline,
+            "rss_growth_bytes": (
+                rss_values[-1] - rss_values[0] if rss_values else None
+            ),
+        },
+    }
+
+
+# --- reporting -----------------------------------------------------------
+
+def render_load_test_summary(report: Dict[str, Any]) -> str:
+    """Plain-text summary table for a `run_load_test` report."""
+    headers = [
+        "Target QPS",
+        "Achieved",
+        "Requests",
+        "Errors",
+        "p50 ms",
+        "p95 ms",
+        "p99 ms",
+        "max ms",
+        "RSS MiB",
+        "Saturated",
+    ]
+    rows: List[List[str]] = []
+    for step in report["steps"]:
+        lat = step["latency_ms"]
+        rss = step["rss_bytes_end"]
+        rows.append(
+            [
+                f"{step['target_qps']:.1f}",
+                f"{step['throughput_qps']:.1f}",
+                str(step["requests"]),
+                f"{step['errors']} ({step['error_rate']:.1%})",
+                f"{lat['p50']:.2f}",
+                f"{lat['p95']:.2f}",
+                f"{lat['p99']:.2f}",
+                f"{lat['max']:.2f}",
+                f"{rss / 2**20:.1f}" if rss else "n/a",
+                "yes" if step["saturated"] else "no",
+            ]
+        )
+
+    widths = [
+        max(len(headers[i]), *(len(r[i]) for r in rows)) if rows
+        else len(headers[i])
+        for i in range(len(headers))
+    ]
+
+    def fmt(cells: List[str]) -> str:
+        return "  ".join(c.rjust(w) for c, w in zip(cells, widths))
+
+    lines = [fmt(headers), fmt(["-" * w for w in widths])]
+    lines.extend(fmt(r) for r in rows)
+
+    saturation = report["saturation"]
+    lines.append("")
+    if saturation["saturated_at_qps"] is None:
+        lines.append("Saturation: not reached within the tested range.")
+    else:
+        lines.append(
+            f"Saturation: {saturation['saturated_at_qps']} qps "
+            f"({saturation['reason']})."
+        )
+    sustainable = saturation["max_sustainable_qps"]
+    lines.append(
+        "Max sustainable rate: "
+        + ("none of the tested rates" if sustainable is None
+           else f"{sustainable} qps")
+    )
+    growth = report["memory"]["rss_growth_bytes"]
+    if growth is not None:
+        lines.append(f"RSS growth over run: {growth / 2**20:+.1f} MiB")
+    return "\n".join(lines) + "\n"